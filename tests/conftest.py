@@ -0,0 +1,41 @@
+"""
+Shared pytest configuration for the Mergington High School Activities API tests
+"""
+
+import copy
+
+import pytest
+from src.app import activities
+
+activities_snapshot_key = pytest.StashKey[dict]()
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "readonly: test does not mutate activities, so skip the reset after it",
+    )
+    # Taken before collection, once per process (so once per xdist worker)
+    config.stash[activities_snapshot_key] = copy.deepcopy(activities)
+
+
+def _participants(activity):
+    return activities[activity]["participants"]
+
+
+@pytest.fixture
+def participants():
+    """Look up an activity's participants in-process, without a GET request"""
+    return _participants
+
+
+@pytest.fixture(autouse=True)
+def reset_activities(request):
+    """Reset activities data after each test that may have mutated it"""
+    yield
+    if request.node.get_closest_marker("readonly"):
+        return
+    snapshot = request.config.stash[activities_snapshot_key]
+    activities.update(
+        {k: {**v, "participants": list(v["participants"])} for k, v in snapshot.items()}
+    )
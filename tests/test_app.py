@@ -2,46 +2,45 @@
 Test suite for the Mergington High School Activities API
 """
 
-import pytest
-from fastapi.testclient import TestClient
-from src.app import app, activities
+import asyncio
 
+import pytest
+from httpx import ASGITransport, AsyncClient
+from src.app import app
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+_SIGNUP_NEW = "/activities/Chess Club/signup?email=newstudent@mergington.edu"
+_UNREG_MICHAEL = "/activities/Chess Club/unregister?email=michael@mergington.edu"
+_ART_EMAILS = tuple(f"student{i}@mergington.edu" for i in (1, 2, 3))
+_ART_URLS = tuple(
+    f"/activities/Art Studio/signup?email={email}" for email in _ART_EMAILS
+)
 
 
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities data before each test"""
-    # Store original state
-    original_activities = {
-        k: {**v, "participants": v["participants"].copy()}
-        for k, v in activities.items()
-    }
-    yield
-    # Restore original state
-    for key in activities:
-        activities[key]["participants"] = original_activities[key]["participants"]
+@pytest.fixture(scope="session")
+async def client():
+    """Create a single async test client for the FastAPI app, shared by all tests"""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as c:
+        yield c
 
 
+@pytest.mark.readonly
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
 
-    def test_get_activities_returns_all_activities(self, client):
+    async def test_get_activities_returns_all_activities(self, client):
         """Test that GET /activities returns all activities"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         assert response.status_code == 200
         data = response.json()
         assert len(data) == 9
         assert "Chess Club" in data
         assert "Programming Class" in data
 
-    def test_get_activities_has_correct_structure(self, client):
+    async def test_get_activities_has_correct_structure(self, client):
         """Test that activities have the expected structure"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         data = response.json()
         activity = data["Chess Club"]
         assert "description" in activity
@@ -50,9 +49,9 @@ class TestGetActivities:
         assert "participants" in activity
         assert isinstance(activity["participants"], list)
 
-    def test_get_activities_has_initial_participants(self, client):
+    async def test_get_activities_has_initial_participants(self, client):
         """Test that activities have initial participants"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         data = response.json()
         assert len(data["Chess Club"]["participants"]) == 2
         assert "michael@mergington.edu" in data["Chess Club"]["participants"]
@@ -61,150 +60,147 @@ class TestGetActivities:
 class TestSignUp:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
 
-    def test_signup_successful(self, client):
+    async def test_signup_successful(self, client):
         """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Chess Club/signup?email=newstudent@mergington.edu"
-        )
+        response = await client.post(_SIGNUP_NEW)
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
         assert "Signed up" in data["message"]
 
-    def test_signup_adds_participant(self, client):
+    async def test_signup_adds_participant(self, client, participants):
         """Test that signup adds participant to activity"""
-        email = "newstudent@mergington.edu"
-        client.post(f"/activities/Chess Club/signup?email={email}")
-        
+        await client.post(_SIGNUP_NEW)
+
         # Verify participant was added
-        response = client.get("/activities")
-        assert email in response.json()["Chess Club"]["participants"]
-
-    def test_signup_duplicate_fails(self, client):
-        """Test that duplicate signup returns 400 error"""
-        email = "michael@mergington.edu"  # Already registered
-        response = client.post(f"/activities/Chess Club/signup?email={email}")
-        assert response.status_code == 400
-        assert "already signed up" in response.json()["detail"]
-
-    def test_signup_nonexistent_activity_fails(self, client):
-        """Test signup for non-existent activity returns 404"""
-        response = client.post(
-            "/activities/Nonexistent Club/signup?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"]
-
-    def test_signup_multiple_participants(self, client):
+        assert "newstudent@mergington.edu" in participants("Chess Club")
+
+    async def test_signup_multiple_participants(self, client, participants):
         """Test signing up multiple different participants"""
-        emails = [
-            "student1@mergington.edu",
-            "student2@mergington.edu",
-            "student3@mergington.edu",
-        ]
-        for email in emails:
-            response = client.post(f"/activities/Art Studio/signup?email={email}")
+        # The signup endpoint is a sync def, so Starlette runs these POSTs in
+        # worker threads and the order they land in is not deterministic
+        responses = await asyncio.gather(*(client.post(url) for url in _ART_URLS))
+        for response in responses:
             assert response.status_code == 200
 
         # Verify all were added
-        response = client.get("/activities")
-        participants = response.json()["Art Studio"]["participants"]
-        for email in emails:
-            assert email in participants
+        art_participants = participants("Art Studio")
+        for email in _ART_EMAILS:
+            assert email in art_participants
 
 
 class TestUnregister:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
 
-    def test_unregister_successful(self, client):
+    async def test_unregister_successful(self, client):
         """Test successful unregister from an activity"""
-        email = "michael@mergington.edu"
-        response = client.delete(
-            f"/activities/Chess Club/unregister?email={email}"
-        )
+        response = await client.delete(_UNREG_MICHAEL)
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
         assert "Unregistered" in data["message"]
 
-    def test_unregister_removes_participant(self, client):
+    async def test_unregister_removes_participant(self, client, participants):
         """Test that unregister removes participant from activity"""
-        email = "michael@mergington.edu"
-        client.delete(f"/activities/Chess Club/unregister?email={email}")
-        
+        await client.delete(_UNREG_MICHAEL)
+
         # Verify participant was removed
-        response = client.get("/activities")
-        assert email not in response.json()["Chess Club"]["participants"]
-
-    def test_unregister_nonexistent_activity_fails(self, client):
-        """Test unregister from non-existent activity returns 404"""
-        response = client.delete(
-            "/activities/Nonexistent Club/unregister?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"]
-
-    def test_unregister_nonexistent_participant_fails(self, client):
-        """Test unregister for non-registered participant returns 400"""
-        response = client.delete(
-            "/activities/Chess Club/unregister?email=notregistered@mergington.edu"
-        )
-        assert response.status_code == 400
-        assert "not registered" in response.json()["detail"]
-
-    def test_unregister_multiple_times_fails(self, client):
+        assert "michael@mergington.edu" not in participants("Chess Club")
+
+    async def test_unregister_multiple_times_fails(self, client):
         """Test that unregistering twice fails"""
-        email = "michael@mergington.edu"
         # First unregister succeeds
-        response1 = client.delete(f"/activities/Chess Club/unregister?email={email}")
+        response1 = await client.delete(_UNREG_MICHAEL)
         assert response1.status_code == 200
-        
+
         # Second unregister fails
-        response2 = client.delete(f"/activities/Chess Club/unregister?email={email}")
+        response2 = await client.delete(_UNREG_MICHAEL)
         assert response2.status_code == 400
 
 
+class TestErrorPaths:
+    """Tests for signup and unregister requests that are rejected"""
+
+    @pytest.mark.parametrize(
+        "method,path,expected_status,detail_substr",
+        [
+            (
+                "POST",
+                "/activities/Nonexistent Club/signup?email=test@mergington.edu",
+                404,
+                b"not found",
+            ),
+            (
+                "DELETE",
+                "/activities/Nonexistent Club/unregister?email=test@mergington.edu",
+                404,
+                b"not found",
+            ),
+            (
+                "DELETE",
+                "/activities/Chess Club/unregister?email=notregistered@mergington.edu",
+                400,
+                b"not registered",
+            ),
+            (
+                "POST",
+                "/activities/Chess Club/signup?email=michael@mergington.edu",
+                400,
+                b"already signed up",
+            ),
+        ],
+        ids=[
+            "signup-nonexistent-activity",
+            "unregister-nonexistent-activity",
+            "unregister-nonexistent-participant",
+            "signup-duplicate",
+        ],
+    )
+    async def test_error_paths(
+        self, client, method, path, expected_status, detail_substr
+    ):
+        """Test that invalid signup/unregister requests return the right error"""
+        response = await client.request(method, path)
+        assert response.status_code == expected_status
+        assert detail_substr in response.content
+
+
 class TestSignupAndUnregisterFlow:
     """Integration tests for signup and unregister flows"""
 
-    def test_signup_then_unregister(self, client):
+    async def test_signup_then_unregister(self, client, participants):
         """Test signing up and then unregistering"""
         email = "testuser@mergington.edu"
         activity = "Programming Class"
         
         # Sign up
-        response = client.post(f"/activities/{activity}/signup?email={email}")
+        response = await client.post(f"/activities/{activity}/signup?email={email}")
         assert response.status_code == 200
         
         # Verify signed up
-        response = client.get("/activities")
-        assert email in response.json()[activity]["participants"]
+        assert email in participants(activity)
         
         # Unregister
-        response = client.delete(f"/activities/{activity}/unregister?email={email}")
+        response = await client.delete(f"/activities/{activity}/unregister?email={email}")
         assert response.status_code == 200
         
         # Verify unregistered
-        response = client.get("/activities")
-        assert email not in response.json()[activity]["participants"]
+        assert email not in participants(activity)
 
-    def test_signup_unregister_signup_again(self, client):
+    async def test_signup_unregister_signup_again(self, client, participants):
         """Test signing up, unregistering, and signing up again"""
         email = "testuser@mergington.edu"
         activity = "Tennis Club"
         
         # Sign up
-        client.post(f"/activities/{activity}/signup?email={email}")
-        response = client.get("/activities")
-        assert email in response.json()[activity]["participants"]
+        await client.post(f"/activities/{activity}/signup?email={email}")
+        assert email in participants(activity)
         
         # Unregister
-        client.delete(f"/activities/{activity}/unregister?email={email}")
-        response = client.get("/activities")
-        assert email not in response.json()[activity]["participants"]
+        await client.delete(f"/activities/{activity}/unregister?email={email}")
+        assert email not in participants(activity)
         
         # Sign up again - should succeed
-        response = client.post(f"/activities/{activity}/signup?email={email}")
+        response = await client.post(f"/activities/{activity}/signup?email={email}")
         assert response.status_code == 200
-        response = client.get("/activities")
-        assert email in response.json()[activity]["participants"]
+        assert email in participants(activity)